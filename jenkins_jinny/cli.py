@@ -46,10 +46,20 @@ def diff_job_params(urls, to_html, diff_only, with_pdb, fmt):
 @cli.command()
 @click.argument('url', nargs=1)
 @click.option('-f', 'fmt', default="", help=FORMAT_HELP)
+@click.option('--max-depth', 'max_depth', type=int, default=None,
+              help="Limit of levels below the root build")
+@click.option('--max-nodes', 'max_nodes', type=int, default=None,
+              help="Limit of downstream builds to fetch")
+@click.option('--stop-on', 'stop_on', default=None,
+              type=click.Choice(['SUCCESS', 'FAILURE', 'UNSTABLE',
+                                 'ABORTED', 'NOT_BUILT'],
+                                case_sensitive=False),
+              help="Stop traversal at first build with this status")
 @click.option("--pdb", "with_pdb", is_flag=True, default=False, help=PDB_HELP)
-def build_flow(url, fmt, with_pdb):
+def build_flow(url, fmt, max_depth, max_nodes, stop_on, with_pdb):
     with pdb_context(with_pdb):
-        main.build_flow(url, fmt)
+        main.build_flow(url, fmt, max_depth=max_depth, max_nodes=max_nodes,
+                        stop_on=stop_on.upper() if stop_on else None)
 
 
 @cli.command()
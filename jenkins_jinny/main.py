@@ -1,3 +1,4 @@
+import collections
 import enum
 
 import numpy as np
@@ -183,13 +184,27 @@ class Build:
 
     @property
     def heirs(self):
-        if self._heirs: return self._heirs
-        self._heirs = children(self)
+        if self._heirs is not None: return self._heirs
+        self._heirs = list(children(self))
         return self._heirs
 
-    def get_child_job(self, name_pattern):
+    def get_child_job(self, name_pattern, max_depth=None, max_nodes=None,
+                      stop=None):
+        """
+        Returns downstream builds which names contain name_pattern
+
+        :param max_depth: int, limit of levels below this build
+        :param max_nodes: int, limit of downstream builds to fetch
+        :param stop: callable receiving a build, traversal ends after the
+        first build it returns True for
+        """
+        if max_depth is None and max_nodes is None and stop is None:
+            _heirs = self.heirs
+        else:
+            _heirs = children(self, max_depth=max_depth,
+                              max_nodes=max_nodes, stop=stop)
         return [ch
-                for ch in self.heirs
+                for ch in _heirs
                 if name_pattern in ch.name]
 
     def get_build_info(self):
@@ -327,50 +342,121 @@ def diff_job_params(urls, diff_only=False, to_html=False, fmt=None):
         print(table)
 
 
-def parents(build):
+def _upstream(build):
     _p = build.parent
-    if _p is None: pass
-    yield _p
-    yield from parents(_p)
+    return [] if _p is None else [_p]
 
 
-def children(build):
-    _children = build.children
-    if _children.__len__() == 0: pass
-    for child in _children:
-        yield child
-        yield from children(child)
+def _downstream(build):
+    return build.children
 
 
-def find_root(build: Build):
-    for node in parents(build):
-        if node is None: return build
-        # print(f"{node=} in parents of {build=}")
-        if node.parent is None:
-            print(f"Found root {node=}")
-            return node
-
+def walk(build, neighbours, max_depth=None, max_nodes=None, stop=None):
+    """
+    Iterative breadth-first traversal starting from (but not including) build.
+
+    Yields tuples (depth, source, node) where source is the build node was
+    first reached from. Every build is visited once, at its smallest depth,
+    even if it is reachable via several paths, so cycles and diamond-shaped
+    pipelines are safe.
+
+    :param neighbours: callable returning list of adjacent builds
+    :param max_depth: int, do not go deeper than this level (1 = direct
+    neighbours only, 0 = nothing)
+    :param max_nodes: int, stop after yielding this number of builds
+    :param stop: callable receiving a build; traversal stops right after
+    the first build for which it returns True (e.g. first FAILURE)
+    """
+    if max_depth is not None and max_depth < 1:
+        return
+    if max_nodes is not None and max_nodes < 1:
+        return
+    visited = {str(build)}
+    queue = collections.deque([(0, build)])
+    count = 0
+    while queue:
+        depth, current = queue.popleft()
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for node in neighbours(current):
+            key = str(node)
+            if key in visited:
+                continue
+            visited.add(key)
+            yield depth + 1, current, node
+            count += 1
+            if stop is not None and stop(node):
+                return
+            if max_nodes is not None and count >= max_nodes:
+                return
+            queue.append((depth + 1, node))
+
+
+def parents(build, max_depth=None, max_nodes=None, stop=None):
+    for _, _, node in walk(build, _upstream, max_depth=max_depth,
+                           max_nodes=max_nodes, stop=stop):
+        yield node
+
+
+def children(build, max_depth=None, max_nodes=None, stop=None):
+    for _, _, node in walk(build, _downstream, max_depth=max_depth,
+                           max_nodes=max_nodes, stop=stop):
+        yield node
+
+
+def find_root(build: Build, max_depth=None, max_nodes=None, stop=None):
+    """
+    Returns the topmost upstream build of build (or build itself if it
+    wasn't triggered by another job). With max_depth, max_nodes or stop
+    the search ends earlier and the last reached upstream is returned.
+    """
+    root = build
+    for node in parents(build, max_depth=max_depth, max_nodes=max_nodes,
+                        stop=stop):
+        root = node
+    if root is not build:
+        print(f"Found root {root=}")
+    return root
+
+
+def _has_result(build, result):
+    # Only finished builds have 'result', so a single get_build_info call
+    # is enough (Build.status would also fetch the whole queue)
+    try:
+        return build.get_build_info().get('result') == result
+    except jenkins.JenkinsException as e:
+        print(f"{e}")
+        return False
+
+
+def build_flow(url, fmt, max_depth=None, max_nodes=None, stop_on=None):
+    """
+    Prints tree of builds started from the root of url's pipeline
 
-def build_flow(url, fmt):
+    :param max_depth: int, limit of levels below the root
+    :param max_nodes: int, limit of downstream builds to fetch
+    :param stop_on: str, build status (e.g. FAILURE) to stop traversal at
+    """
     if fmt:
         globals()['fmt'] = fmt
     build = Build(url=url)
-    _jenkins = build.server
+    stop = (lambda b: _has_result(b, stop_on)) if stop_on else None
     G = nx.DiGraph()
     root_node = find_root(build)
+    builds = {str(root_node): root_node}
+    depths = {str(root_node): 0}
     G.add_node(str(root_node), label="root")
-    for child in children(root_node):
+    for depth, source, child in walk(root_node, _downstream,
+                                     max_depth=max_depth,
+                                     max_nodes=max_nodes,
+                                     stop=stop):
+        builds[str(child)] = child
+        depths[str(child)] = depth
         G.add_node(str(child))
-        G.add_edge(str(child.parent), str(child))
-        # print(f"{child}= from {child.parent=}")
+        G.add_edge(str(source), str(child))
     T = nx.dfs_tree(G, str(root_node))
     for node in T:
-        depth = nx.shortest_path_length(G, source=str(root_node), target=node)
-        job_name, build_number = parse("{}#{}", node)
-        build = Build(job_name=job_name,
-                      build_number=build_number,
-                      server=_jenkins)
-        print(f"{'  ' * depth} {build}")
+        print(f"{'  ' * depths[node]} {builds[node]}")
 
     # ipdb.set_trace()
     # nx.write_latex(G, "just_my_figure.tex")
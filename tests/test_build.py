@@ -0,0 +1,133 @@
+import collections
+
+import jenkins
+import pytest
+from click.testing import CliRunner
+
+import jenkins_jinny.cli as cli
+import jenkins_jinny.main as main
+
+SERVER_URL = "http://jenkins.local"
+
+# root -> A, C; A -> B; B -> C (diamond); C -> D
+PIPELINE = {
+    "root": ["A", "C"],
+    "A": ["B"],
+    "B": ["C"],
+    "C": ["D"],
+}
+
+
+class StubServer:
+    def __init__(self, pipeline, results=None, discarded=()):
+        self.server = SERVER_URL
+        self.pipeline = pipeline
+        self.results = results or {}
+        self.discarded = set(discarded)
+        self.console_calls = collections.Counter()
+
+    def _check_exists(self, name):
+        if name in self.discarded:
+            raise jenkins.JenkinsException(f"{name} does not exist")
+
+    def get_build_info(self, name, number):
+        self._check_exists(name)
+        return {
+            "actions": [{"causes": []}],
+            "result": self.results.get(name, "SUCCESS"),
+        }
+
+    def get_build_console_output(self, name, number):
+        self.console_calls[name] += 1
+        self._check_exists(name)
+        return "\n".join(f"Starting building: {child} #1"
+                         for child in self.pipeline.get(name, []))
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    def make(**kwargs):
+        server = StubServer(PIPELINE, **kwargs)
+        monkeypatch.setattr(main.jenkins, "Jenkins",
+                            lambda *args, **kw: server)
+        return server
+    return make
+
+
+def flow_lines(capsys, **kwargs):
+    main.build_flow(f"{SERVER_URL}/job/root/1", fmt="", **kwargs)
+    return capsys.readouterr().out.splitlines()
+
+
+def tree(*nodes):
+    return [f"{'  ' * depth} {name}#1" for depth, name in nodes]
+
+
+def test_build_flow_uses_walk_edges_and_depths(stub_server, capsys):
+    stub_server()
+    assert flow_lines(capsys) == tree(
+        (0, "root"), (1, "A"), (2, "B"), (1, "C"), (2, "D"))
+
+
+def test_build_flow_max_depth(stub_server, capsys):
+    stub_server()
+    assert flow_lines(capsys, max_depth=1) == tree(
+        (0, "root"), (1, "A"), (1, "C"))
+
+
+def test_build_flow_stop_on(stub_server, capsys):
+    server = stub_server(results={"A": "FAILURE"})
+    assert flow_lines(capsys, stop_on="FAILURE") == tree(
+        (0, "root"), (1, "A"))
+    assert server.console_calls["A"] == 0
+
+
+def test_build_flow_stop_on_discarded_build(stub_server, capsys):
+    stub_server(discarded={"C"})
+    lines = flow_lines(capsys, stop_on="FAILURE")
+    assert [line for line in lines if "#1" in line] == tree(
+        (0, "root"), (1, "A"), (2, "B"), (1, "C"))
+
+
+def test_has_result_handles_discarded_build(stub_server):
+    server = stub_server(discarded={"A"})
+    build = main.Build(job_name="A", build_number=1, server=server)
+    assert main._has_result(build, "FAILURE") is False
+
+
+def test_cli_stop_on_is_case_insensitive(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "build_flow",
+                        lambda url, fmt, **kwargs: calls.append(kwargs))
+    result = CliRunner().invoke(
+        cli.cli, ["build-flow", f"{SERVER_URL}/job/root/1",
+                  "--stop-on", "failure"])
+    assert result.exit_code == 0, result.output
+    assert calls[0]["stop_on"] == "FAILURE"
+
+
+def test_cli_stop_on_rejects_unknown_status():
+    result = CliRunner().invoke(
+        cli.cli, ["build-flow", f"{SERVER_URL}/job/root/1",
+                  "--stop-on", "BROKEN"])
+    assert result.exit_code != 0
+
+
+def test_heirs_is_cached_list(stub_server):
+    server = stub_server()
+    build = main.Build(job_name="root", build_number=1, server=server)
+    heirs = build.heirs
+    assert isinstance(heirs, list)
+    assert [str(b) for b in heirs] == ["A#1", "C#1", "B#1", "D#1"]
+    calls = sum(server.console_calls.values())
+    assert build.heirs is heirs
+    assert sum(server.console_calls.values()) == calls
+
+
+def test_get_child_job_with_limits_skips_heirs_cache(stub_server):
+    server = stub_server()
+    build = main.Build(job_name="root", build_number=1, server=server)
+    assert [str(b) for b in build.get_child_job("B", max_depth=1)] == []
+    assert build._heirs is None
+    assert [str(b) for b in build.get_child_job("B")] == ["B#1"]
+    assert build._heirs is not None
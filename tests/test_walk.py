@@ -0,0 +1,86 @@
+import types
+
+import pytest
+
+from jenkins_jinny.main import walk, find_root
+
+
+def neighbours_of(graph):
+    return lambda node: graph.get(node, [])
+
+
+def nodes(result):
+    return [node for _, _, node in result]
+
+
+DIAMOND = {
+    'R': ['A', 'C'],
+    'A': ['B'],
+    'B': ['C'],
+    'C': ['D'],
+}
+
+
+def test_cycle_terminates():
+    graph = {'a': ['b'], 'b': ['c'], 'c': ['a']}
+    assert nodes(walk('a', neighbours_of(graph))) == ['b', 'c']
+
+
+def test_diamond_yields_each_build_once():
+    result = list(walk('R', neighbours_of(DIAMOND)))
+    assert sorted(nodes(result)) == ['A', 'B', 'C', 'D']
+    depths = {node: depth for depth, _, node in result}
+    assert depths == {'A': 1, 'C': 1, 'B': 2, 'D': 2}
+
+
+def test_diamond_reports_first_source():
+    sources = {node: source
+               for _, source, node in walk('R', neighbours_of(DIAMOND))}
+    assert sources == {'A': 'R', 'C': 'R', 'B': 'A', 'D': 'C'}
+
+
+@pytest.mark.parametrize("max_depth, expected", [
+    (0, []),
+    (1, ['A', 'C']),
+    (2, ['A', 'C', 'B', 'D']),
+    (3, ['A', 'C', 'B', 'D']),
+])
+def test_max_depth(max_depth, expected):
+    result = walk('R', neighbours_of(DIAMOND), max_depth=max_depth)
+    assert nodes(result) == expected
+
+
+@pytest.mark.parametrize("max_nodes, expected", [
+    (0, []),
+    (1, ['A']),
+    (3, ['A', 'C', 'B']),
+    (10, ['A', 'C', 'B', 'D']),
+])
+def test_max_nodes(max_nodes, expected):
+    result = walk('R', neighbours_of(DIAMOND), max_nodes=max_nodes)
+    assert nodes(result) == expected
+
+
+def test_zero_limits_do_not_fetch_neighbours():
+    def neighbours(node):
+        raise AssertionError(f"neighbours of {node} were requested")
+
+    assert list(walk('R', neighbours, max_depth=0)) == []
+    assert list(walk('R', neighbours, max_nodes=0)) == []
+
+
+def test_stop_halts_after_matching_node():
+    result = walk('R', neighbours_of(DIAMOND), stop=lambda node: node == 'C')
+    assert nodes(result) == ['A', 'C']
+
+
+def test_find_root_without_parent_returns_build():
+    build = types.SimpleNamespace(parent=None)
+    assert find_root(build) is build
+
+
+def test_find_root_returns_topmost_parent():
+    root = types.SimpleNamespace(parent=None)
+    middle = types.SimpleNamespace(parent=root)
+    build = types.SimpleNamespace(parent=middle)
+    assert find_root(build) is root